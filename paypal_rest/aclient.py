@@ -0,0 +1,194 @@
+"""aclient.py - Asynchronous PayPal API client class"""
+# Copyright © 2020  Brett Smith
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import datetime
+import logging
+import time
+
+import aiohttp  # type:ignore[import]
+
+from typing import (
+    Any,
+    AsyncIterator,
+    List,
+    Optional,
+    Union,
+)
+from . import client as clientmod
+from .paypal_types import APIResponse
+from .transaction import Transaction
+
+class AsyncPayPalAPIClient:
+    """Asynchronous counterpart to ``PayPalAPIClient``
+
+    This class fetches transaction listings over aiohttp, pipelining date
+    windows and result pages over one connection pool. It covers the
+    read-side transaction APIs; for everything else, and for synchronous
+    callers, use ``PayPalAPIClient``.
+
+    This module requires aiohttp, which is an optional dependency: install
+    ``paypal_rest[async]`` to get it. Importing ``paypal_rest`` itself never
+    imports aiohttp.
+
+    Use the class as an async context manager so its session is closed::
+
+        async with AsyncPayPalAPIClient.from_client_secret(...) as paypal:
+            async for txn in paypal.aiter_transactions(start, end):
+                ...
+    """
+    # Bound concurrent window fetches like the sync client does, for the
+    # same reason: stay clear of PayPal's rate limits.
+    WINDOW_MAX_CONCURRENCY = clientmod.PayPalAPIClient.WINDOW_MAX_WORKERS
+
+    def __init__(
+            self,
+            client_id: str,
+            client_secret: str,
+            root_url: Union[str, clientmod.PayPalSite]=clientmod.PayPalSite.SANDBOX,
+            logger: Optional[logging.Logger]=None,
+    ) -> None:
+        self._client_id = client_id
+        self._client_secret = client_secret
+        if isinstance(root_url, str):
+            self._root_url = root_url
+        else:
+            self._root_url = root_url.url()
+        self._url_prefix = self._root_url.rstrip('/')
+        if logger is None:
+            logger = clientmod._default_logger(self._root_url)
+        self.logger = logger
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300),
+        )
+        self._token_cache_key = (
+            clientmod.PayPalSession.TOKEN_PATH, client_id, client_secret,
+        )
+        self._token_lock = asyncio.Lock()
+
+    @classmethod
+    def from_client_secret(
+            cls,
+            client_id: str,
+            client_secret: str,
+            root_url: Union[str, clientmod.PayPalSite]=clientmod.PayPalSite.SANDBOX,
+            logger: Optional[logging.Logger]=None,
+    ) -> 'AsyncPayPalAPIClient':
+        """Constructor matching ``PayPalAPIClient.from_client_secret``"""
+        return cls(client_id, client_secret, root_url, logger)
+
+    async def __aenter__(self) -> 'AsyncPayPalAPIClient':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying HTTP session"""
+        await self._session.close()
+
+    async def _access_token(self) -> str:
+        """Return a valid bearer token, fetching one if necessary
+
+        Tokens are shared with ``PayPalSession`` through the module-level
+        cache in ``client``, so sync and async clients with the same
+        credentials reuse one token.
+        """
+        async with self._token_lock:
+            with clientmod._TOKEN_CACHE_LOCK:
+                token = clientmod._TOKEN_CACHE.get(self._token_cache_key)
+            if (token is not None
+                and token.get('expires_at', 0) - time.time()
+                    > clientmod._TOKEN_EXPIRY_SLOP_SECS):
+                return token['access_token']
+            async with self._session.post(
+                    self._url_prefix + clientmod.PayPalSession.TOKEN_PATH,
+                    data={'grant_type': 'client_credentials'},
+                    auth=aiohttp.BasicAuth(self._client_id, self._client_secret),
+            ) as response:
+                response.raise_for_status()
+                token = await response.json()
+            token['expires_at'] = time.time() + float(token.get('expires_in', 0))
+            with clientmod._TOKEN_CACHE_LOCK:
+                clientmod._TOKEN_CACHE[self._token_cache_key] = token
+            return token['access_token']
+
+    async def _get_json(
+            self,
+            path: str,
+            params: clientmod.Params,
+    ) -> APIResponse:
+        url = self._url_prefix + path
+        response_json: APIResponse = {}
+        for can_retry in [True, False]:
+            headers = {'Authorization': f'Bearer {await self._access_token()}'}
+            async with self._session.get(
+                    url, params=dict(params), headers=headers,
+            ) as response:
+                if response.status == 401 and can_retry:
+                    # Token expired underneath us: drop it and try again.
+                    with clientmod._TOKEN_CACHE_LOCK:
+                        clientmod._TOKEN_CACHE.pop(self._token_cache_key, None)
+                    continue
+                if response.status >= 400:
+                    self._log_error(await response.json())
+                response.raise_for_status()
+                response_json = await response.json()
+                break
+        return response_json
+
+    def _log_error(self, error: APIResponse) -> None:
+        clientmod.PayPalAPIClient._log_error(self, error)  # type:ignore[arg-type]
+
+    async def _fetch_window(self, params: clientmod.Params) -> List[Transaction]:
+        path = '/v1/reporting/transactions'
+        response = await self._get_json(path, dict(params, page='1'))
+        retval = list(map(Transaction, response['transaction_details']))
+        total_pages: int = response['total_pages']
+        if response['page'] < total_pages:
+            pages = await asyncio.gather(*(
+                self._get_json(path, dict(params, page=str(page)))
+                for page in range(2, total_pages + 1)
+            ))
+            for page_response in pages:
+                retval.extend(map(Transaction, page_response['transaction_details']))
+        return retval
+
+    async def aiter_transactions(
+            self,
+            start_date: datetime.datetime,
+            end_date: datetime.datetime,
+            fields: clientmod.TransactionFields=clientmod.TransactionFields.TRANSACTION,
+    ) -> AsyncIterator[Transaction]:
+        """Iterate transactions over a date range
+
+        The asynchronous counterpart to ``PayPalAPIClient.iter_transactions``:
+        same arguments, same window ordering, but date windows and result
+        pages are fetched concurrently over one event loop.
+        """
+        window_params = list(clientmod.PayPalAPIClient._iter_date_params(
+            start_date, end_date, {'fields': fields.param_value()},
+        ))
+        semaphore = asyncio.Semaphore(self.WINDOW_MAX_CONCURRENCY)
+        async def fetch_bounded(params: clientmod.Params) -> List[Transaction]:
+            async with semaphore:
+                return await self._fetch_window(params)
+        for window_future in [
+                asyncio.ensure_future(fetch_bounded(params))
+                for params in window_params
+        ]:
+            for txn in await window_future:
+                yield txn
@@ -14,12 +14,15 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import collections
+import concurrent.futures
 import datetime
 import enum
+import functools
 import logging
-import math
 import operator
+import random
+import threading
+import time
 import urllib.parse as urlparse
 
 import requests
@@ -28,14 +31,30 @@ from oauthlib import oauth2  # type:ignore[import]
 
 from typing import (
     Any,
+    Callable,
+    ClassVar,
+    Dict,
     Iterator,
+    List,
     Mapping,
+    MutableMapping,
     Optional,
     Sequence,
+    Tuple,
     Type,
     TypeVar,
     Union,
 )
+
+# orjson decodes typical API responses severalfold faster than the stdlib.
+# Use it when it's available, but don't require it.
+_json_loads: Callable[[bytes], Any]
+try:
+    import orjson  # type:ignore[import]
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
 from .paypal_types import (
     APIResponse,
 )
@@ -43,6 +62,38 @@ from .transaction import Transaction
 
 FieldsType = TypeVar('FieldsType', bound='PayPalFields')
 Params = Mapping[str, str]
+Token = Dict[str, Any]
+
+logger = logging.getLogger('paypal_rest.client')
+
+@functools.lru_cache(maxsize=8)
+def _default_logger(root_url: str) -> logging.Logger:
+    """Return the default logger for a client of the given endpoint
+
+    Cached because clients are nearly always built for one of the two
+    PayPalSite endpoints, and test suites construct many of them.
+    """
+    host_parts = urlparse.urlsplit(root_url).netloc.split('.')
+    host_parts.reverse()
+    return logging.getLogger(f'paypal_rest.PayPalAPIClient.{".".join(host_parts)}')
+
+@functools.lru_cache(maxsize=256)
+def _isoformat_param(date: datetime.datetime) -> str:
+    """Format a window boundary date the way the search API expects
+
+    Cached because the same boundaries recur across windows and across
+    repeated searches over the same range.
+    """
+    return date.isoformat(timespec='seconds')
+
+
+# OAuth tokens cached across sessions, so short-lived clients with the same
+# credentials don't each pay a round trip to the token endpoint.
+_TOKEN_CACHE: Dict[Tuple[str, str, str], Token] = {}
+_TOKEN_CACHE_LOCK = threading.Lock()
+# Don't reuse a cached token this close to its expiration, to leave headroom
+# for in-flight requests.
+_TOKEN_EXPIRY_SLOP_SECS = 60
 
 class PayPalSite(enum.Enum):
     SANDBOX = 'api-m.sandbox.paypal.com'
@@ -60,6 +111,9 @@ class PayPalFields(enum.Flag):
     and combine them programmatically. The ``param_value`` method then helps
     ``PayPalAPIClient`` format the result when needed.
     """
+    # Annotation only, so the enum metaclass doesn't treat it as a member;
+    # _base_fields() populates it lazily per subclass.
+    _BASE_FIELDS: ClassVar[Tuple[Tuple[int, str], ...]]
 
     @classmethod
     def choices(cls) -> Iterator[str]:
@@ -76,13 +130,9 @@ class PayPalFields(enum.Flag):
         return the combination of all fields.
         """
         if fields:
-            fields_iter = iter(fields)
+            return functools.reduce(operator.or_, fields)
         else:
-            fields_iter = iter(cls)
-        retval = next(fields_iter)
-        for field in fields_iter:
-            retval |= field
-        return retval
+            return functools.reduce(operator.or_, cls)
 
     @classmethod
     def from_arg(cls: Type[FieldsType], arg: str) -> FieldsType:
@@ -92,23 +142,54 @@ class PayPalFields(enum.Flag):
         except KeyError:
             raise ValueError(f"unknown {cls.__name__} {arg!r}") from None
 
+    @classmethod
+    def from_arg_list(cls: Type[FieldsType], arg: str) -> FieldsType:
+        """Return a field object from a comma-separated argument string"""
+        return cls.combine([cls.from_arg(part) for part in arg.split(',')])
+
     def is_base_field(self) -> bool:
         """Return true if this is a single field value, not a combination"""
-        return not math.log2(self.value) % 1
+        # A flag with a single bit set is a power of two.
+        value: int = self.value
+        return value != 0 and not value & (value - 1)
 
     def _base_value(self) -> str:
         return self.name.lower()
 
+    @classmethod
+    def _base_fields(cls) -> Tuple[Tuple[int, str], ...]:
+        """Return a (bit, name) pair for each of this class's base fields
+
+        The set of base fields is class-constant, so it's computed once per
+        class on first use. This can't happen at class-creation time because
+        enum members aren't defined yet when ``__init_subclass__`` runs on
+        the older Pythons this package supports.
+        """
+        try:
+            return cls.__dict__['_BASE_FIELDS']
+        except KeyError:
+            base_fields = tuple(
+                (flag.value, flag._base_value())
+                for flag in cls
+                if flag.is_base_field()
+            )
+            cls._BASE_FIELDS = base_fields
+            return base_fields
+
+    @functools.lru_cache(maxsize=None)
     def param_value(self) -> str:
         """Return these fields formatted as a query string
 
         The result is in the format PayPal's API expects for ``fields``
-        parameters.
+        parameters. Flag members are singletons, so the result is cached
+        per combination: the handful of combinations callers actually use
+        only get formatted once per process.
         """
+        value: int = self.value
         return ','.join(
-            flag._base_value()
-            for flag in type(self)
-            if flag & self and flag.is_base_field()
+            name
+            for bit, name in type(self)._base_fields()
+            if value & bit
         )
 
 
@@ -138,27 +219,74 @@ class PayPalSession(requests_oauthlib.OAuth2Session):
     This is a subclass of requests_oauthlib.OAuth2Session that implements
     PayPal's recommended authorization strategy: if an API request returns
     HTTP Unauthorized, get an OAuth token and retry. This gracefully handles
-    refreshing expired tokens.
+    refreshing expired tokens. Tokens are cached at the module level, so
+    sessions created with the same credentials share one token rather than
+    each fetching their own.
 
     This class only handles the mechanics of handling an HTTP connection.
     It doesn't know anything about the higher-level REST API. That's the job
     of ``PayPalAPIClient``.
     """
     TOKEN_PATH = '/v1/oauth2/token'
+    # Paginated API calls hit the same host many times in a row. Size the
+    # connection pool generously so those calls reuse TLS connections rather
+    # than rebuilding them.
+    POOL_MAXSIZE = 32
+    # How many times to retry a request PayPal throttled with HTTP 429, and
+    # the longest we'll wait between tries when PayPal doesn't say.
+    THROTTLE_RETRIES = 3
+    THROTTLE_MAX_DELAY_SECS = 30
 
     def __init__(self, client: oauth2.Client, client_secret: str) -> None:
         super().__init__(client=client)
+        self.mount('https://', requests.adapters.HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.POOL_MAXSIZE,
+        ))
         self._client_secret = client_secret
+        # The session only ever talks to one host, so the token URL is
+        # computed once from the first request that needs it.
+        self._token_url: Optional[str] = None
+        self._token_cache_key = (self.TOKEN_PATH, client.client_id, client_secret)
+        with _TOKEN_CACHE_LOCK:
+            token = _TOKEN_CACHE.get(self._token_cache_key)
+        if (token is not None
+            and token.get('expires_at', 0) - time.time() > _TOKEN_EXPIRY_SLOP_SECS):
+            self.token = token
+
+    def fetch_token(self, *args: Any, **kwargs: Any) -> Token:
+        token: Token = super().fetch_token(*args, **kwargs)
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE[self._token_cache_key] = token
+        return token
 
     def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
         response = super().request(method, url, **kwargs)
         if response.status_code == requests.codes.UNAUTHORIZED:
+            if self._token_url is None:
+                self._token_url = urlparse.urljoin(url, self.TOKEN_PATH)
             self.fetch_token(
-                token_url=urlparse.urljoin(url, self.TOKEN_PATH),
+                token_url=self._token_url,
                 client_id=self._client.client_id,
                 client_secret=self._client_secret,
             )
             response = super().request(method, url, **kwargs)
+        for attempt in range(self.THROTTLE_RETRIES):
+            if response.status_code != requests.codes.TOO_MANY_REQUESTS:
+                break
+            try:
+                delay = float(response.headers['Retry-After'])
+            except (KeyError, ValueError):
+                delay = min(self.THROTTLE_MAX_DELAY_SECS, 2 ** attempt)
+            # Add jitter so concurrent throttled callers don't retry in
+            # lockstep.
+            delay *= 1 + (random.random() / 2)
+            logger.warning(
+                "PayPal throttled %s %s; retrying in %.1f seconds",
+                method, url, delay,
+            )
+            time.sleep(delay)
+            response = super().request(method, url, **kwargs)
         return response
 
 
@@ -175,6 +303,7 @@ class PayPalAPIClient:
             session: requests.Session,
             root_url: Union[str, PayPalSite]=PayPalSite.SANDBOX,
             logger: Optional[logging.Logger]=None,
+            subscription_cache: Optional[MutableMapping[Tuple[str, int], APIResponse]]=None,
     ) -> None:
         """Low-level constructor
 
@@ -189,17 +318,24 @@ class PayPalAPIClient:
         ``logger`` is a ``logging.Logger`` object where all log messages (like
         API errors) will be sent. If none is provided, this instance will get
         its own, with a name based on the hostname in ``root_url``.
+
+        ``subscription_cache`` is an optional mutable mapping used to cache
+        ``get_subscription`` responses, keyed by subscription id and fields.
+        Pass a plain dict to cache for the client's lifetime, or something
+        like ``cachetools.TTLCache`` for time-bounded caching. The default of
+        None does no caching.
         """
         self._session = session
         if isinstance(root_url, str):
             self._root_url = root_url
         else:
             self._root_url = root_url.url()
+        # API paths always start with '/', so requests can build their URL
+        # by concatenation instead of re-parsing the root URL every call.
+        self._url_prefix = self._root_url.rstrip('/')
+        self._subscription_cache = subscription_cache
         if logger is None:
-            host_parts = urlparse.urlsplit(self._root_url).netloc.split('.')
-            host_parts.reverse()
-            logger_name = f'paypal_rest.PayPalAPIClient.{".".join(host_parts)}'
-            logger = logging.getLogger(logger_name)
+            logger = _default_logger(self._root_url)
         self.logger = logger
 
     @classmethod
@@ -260,23 +396,41 @@ class PayPalAPIClient:
         return cls.from_client_secret(client_id, client_secret, root_url, logger)
 
     def _get_json(self, path: str, params: Optional[Params]=None) -> APIResponse:
-        url = urlparse.urljoin(self._root_url, path)
+        url = self._url_prefix + path
         response = self._session.get(url, params=params)
         try:
             response.raise_for_status()
         except requests.HTTPError:
-            self._log_error(response.json())
+            self._log_error(_json_loads(response.content))
             raise
         else:
-            return response.json()
+            return _json_loads(response.content)
+
+    # Cap on threads used to prefetch result pages. Keep this no larger than
+    # PayPalSession.POOL_MAXSIZE so every worker can hold a pooled connection.
+    PREFETCH_MAX_WORKERS = 16
+    # Cap on threads used to fetch date windows concurrently. Kept modest so
+    # a multi-year scan doesn't trip PayPal's rate limits.
+    WINDOW_MAX_WORKERS = 4
 
     def _iter_pages(self, path: str, params: Params) -> Iterator[APIResponse]:
-        response: APIResponse = {'page': 0, 'total_pages': 1}
-        page_params = collections.ChainMap(params).new_child()
-        while response['page'] < response['total_pages']:
-            page_params['page'] = str(response['page'] + 1)
-            response = self._get_json(path, page_params)
-            yield response
+        def page_params(page: int) -> Params:
+            return dict(params, page=str(page))
+        response = self._get_json(path, page_params(1))
+        yield response
+        total_pages: int = response['total_pages']
+        if response['page'] >= total_pages:
+            return
+        # The first response told us how many pages there are, so fetch the
+        # rest concurrently, yielding them in page order.
+        max_workers = min(total_pages - 1, self.PREFETCH_MAX_WORKERS)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            page_futures = [
+                executor.submit(self._get_json, path, page_params(page))
+                for page in range(2, total_pages + 1)
+            ]
+            for page_future in page_futures:
+                yield page_future.result()
 
     def _log_error(self, error: APIResponse) -> None:
         parts = [
@@ -286,8 +440,8 @@ class PayPalAPIClient:
         ]
         self.logger.error(" — ".join(parts))
 
+    @staticmethod
     def _iter_date_params(
-            self,
             start_date: datetime.datetime,
             end_date: datetime.datetime,
             params: Optional[Params]=None,
@@ -317,25 +471,58 @@ class PayPalAPIClient:
             days_sign = operator.pos
             pred = operator.lt
             limit_func = min
-        retval = collections.ChainMap(params or {}).new_child()
-        retval[key1] = start_date.isoformat(timespec='seconds')
+        base_params = dict(params or {})
+        # Each date is a boundary of two windows, so carry its formatted
+        # string over to the next iteration instead of reformatting it.
+        prev_iso = _isoformat_param(start_date)
         next_date = start_date
         date_diff = datetime.timedelta(days=days_sign(30))
         while pred(next_date, end_date):
             next_date = limit_func(next_date + date_diff, end_date)
-            retval[key2] = next_date.isoformat(timespec='seconds')
-            yield retval
-            retval[key1] = retval[key2]
+            next_iso = _isoformat_param(next_date)
+            yield {**base_params, key1: prev_iso, key2: next_iso}
+            prev_iso = next_iso
 
     def get_subscription(
             self,
             subscription_id: str,
             fields: SubscriptionFields=SubscriptionFields.ALL,
     ) -> APIResponse:
-        """Fetch and return a subscription by its id"""
-        return self._get_json(f'/v1/billing/subscriptions/{subscription_id}', {
+        """Fetch and return a subscription by its id
+
+        If this client was built with a ``subscription_cache``, repeat calls
+        for the same subscription and fields return the cached response
+        instead of calling the API again.
+        """
+        cache = self._subscription_cache
+        if cache is not None:
+            cache_key = (subscription_id, fields.value)
+            try:
+                return cache[cache_key]
+            except KeyError:
+                pass
+        response = self._get_json(f'/v1/billing/subscriptions/{subscription_id}', {
             'fields': fields.param_value(),
         })
+        if cache is not None:
+            cache[cache_key] = response
+        return response
+
+    def invalidate_subscription(self, subscription_id: str) -> None:
+        """Drop any cached responses for a subscription id
+
+        Call this after changing a subscription so later ``get_subscription``
+        calls see fresh data. Does nothing when this client has no
+        ``subscription_cache``.
+        """
+        if self._subscription_cache is None:
+            return
+        stale_keys = [
+            key for key in self._subscription_cache
+            if key[0] == subscription_id
+        ]
+        for key in stale_keys:
+            del self._subscription_cache[key]
 
     def get_transaction(
             self,
@@ -386,10 +573,28 @@ class PayPalAPIClient:
         ``start_date`` and ``end_date`` represent the range to query.
         ``fields`` is a TransactionsFields object that flags the information to
         include in returned Transactions.
+
+        Date windows within the range are fetched concurrently, but
+        transactions are still yielded in window order.
         """
-        for params in self._iter_date_params(start_date, end_date, {
-                'fields': fields.param_value(),
-        }):
+        def fetch_window(params: Params) -> Sequence[Transaction]:
+            # extend+map keeps the per-transaction construction loop in C,
+            # which matters when one window yields thousands of transactions.
+            retval: List[Transaction] = []
             for page in self._iter_pages('/v1/reporting/transactions', params):
-                for txn_source in page['transaction_details']:
-                    yield Transaction(txn_source)
+                retval.extend(map(Transaction, page['transaction_details']))
+            return retval
+        window_params = list(self._iter_date_params(start_date, end_date, {
+                'fields': fields.param_value(),
+        }))
+        if len(window_params) == 1:
+            yield from fetch_window(window_params[0])
+            return
+        max_workers = min(len(window_params), self.WINDOW_MAX_WORKERS)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            window_futures = [
+                executor.submit(fetch_window, params)
+                for params in window_params
+            ]
+            for window_future in window_futures:
+                yield from window_future.result()
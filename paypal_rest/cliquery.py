@@ -31,6 +31,7 @@ from . import paypal_types
 from .transaction import CartItem, Transaction
 
 from typing import (
+    Iterator,
     Optional,
     Sequence,
     TextIO,
@@ -39,9 +40,13 @@ from typing import (
 
 PROGNAME = 'paypal-query'
 
+_UTC = datetime.timezone.utc
+
 logger = logging.getLogger('paypal_rest.cliquery')
 
-class YAMLDumper(yaml.SafeDumper):
+# Subclass libyaml's emitter when PyYAML was built with it; it's severalfold
+# faster and YAML emission dominates wall time on multi-ID lookups.
+class YAMLDumper(getattr(yaml, 'CSafeDumper', yaml.SafeDumper)):  # type:ignore[misc]
     TRANSACTION_FIELD_ORDER = [
         clientmod.TransactionFields.SHIPPING,
         clientmod.TransactionFields.PAYER,
@@ -54,13 +59,19 @@ class YAMLDumper(yaml.SafeDumper):
 
     @classmethod
     def add_transaction_representer(cls, fields: clientmod.TransactionFields) -> None:
-        txn_key_order = [
+        txn_key_order = tuple(
             f'{flag.name.lower()}_info'
             for flag in cls.TRANSACTION_FIELD_ORDER
             if flag & fields
-        ]
+        )
         def transaction_representer(self: 'YAMLDumper', data: Transaction) -> yaml.nodes.MappingNode:
-            return self.represent_dict((key, data[key]) for key in txn_key_order)
+            # Read the underlying response dict directly rather than going
+            # through Transaction.__getitem__ per field, and hand
+            # represent_dict an eager list of pairs.
+            response = data._response
+            return self.represent_dict(
+                [(key, response[key]) for key in txn_key_order if key in response]
+            )
         cls.add_representer(Transaction, transaction_representer)
 
 
@@ -73,11 +84,11 @@ def add_fields_argument(
     return parser.add_argument(
         f'--{type_name}-fields', *short_flags,
         action='append',
-        metavar='FIELD',
-        type=field_type.from_arg,
+        metavar='FIELD[,FIELD,…]',
+        type=field_type.from_arg_list,
         help=f"Only show these field(s) in {type_name} results."
-        " You can specify this option multiple times."
-        f" Choices are {', '.join(field_type.choices())}."
+        " You can separate fields with commas and/or specify this option"
+        f" multiple times. Choices are {', '.join(field_type.choices())}."
     )
 
 def parse_arguments(arglist: Optional[Sequence[str]]=None) -> argparse.Namespace:
@@ -126,36 +137,59 @@ specified, lists all transactions in your specified date range (default last
         args.end_date = datetime.datetime.now(datetime.timezone.utc)
     return args
 
+# Transaction accessors bound once for summarize_transaction, so the
+# per-transaction listing loop resolves each as a module global instead of
+# re-walking class attribute lookup per row.
+_txn_amount = Transaction.amount
+_txn_cart_items = Transaction.cart_items_list
+_txn_fee_amount = Transaction.fee_amount
+_txn_id = Transaction.transaction_id
+_txn_payer_email = Transaction.payer_email
+_txn_payer_fullname = Transaction.payer_fullname
+_txn_status = Transaction.status
+_txn_updated_date = Transaction.updated_date
+
 def summarize_transaction(txn: Transaction, stream: TextIO) -> None:
-    date_s = txn.updated_date().astimezone(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M')
-    status = txn.status().value
+    updated_date = _txn_updated_date(txn)
+    # PayPal timestamps are usually UTC already; only convert when not.
+    if updated_date.tzinfo is not _UTC:
+        updated_date = updated_date.astimezone(_UTC)
+    date_s = updated_date.strftime('%Y-%m-%d %H:%M')
+    status = _txn_status(txn).value
     try:
-        from_s = f"\t{txn.payer_fullname()} ({txn.payer_email()})"
+        from_s = f"\t{_txn_payer_fullname(txn)} ({_txn_payer_email(txn)})"
     except KeyError:
         from_s = ""
-    print(f"{date_s}\t{txn.transaction_id()}\t{status}{from_s}", file=stream)
-    cart = list(txn.cart_items())
+    lines = [f"{date_s}\t{_txn_id(txn)}\t{status}{from_s}"]
+    cart = _txn_cart_items(txn)
     if not cart:
-        txn_name = txn['transaction_info'].get('transaction_subject', "Gross Amount")
-        txn_amt = txn.amount()
+        txn_name = txn._response['transaction_info'].get('transaction_subject', "Gross Amount")
+        txn_amt = _txn_amount(txn)
         cart.append(CartItem(None, txn_name, None, 1, txn_amt, txn_amt))
-    fee_amt = txn.fee_amount()
+    fee_amt = _txn_fee_amount(txn)
     if fee_amt is not None:
         cart.append(CartItem(None, "PayPal Fee", None, 1, fee_amt, fee_amt))
-    names = [
-        item.name or item.description or item.code or "Unknown Item"
-        for item in cart
-    ]
-    amounts = [str(item.total_price) for item in cart]
-    name_len = max(len(name) for name in names)
-    amt_len = max(len(amt_s) for amt_s in amounts)
-    line_fmt = f'  {{:>{name_len}}} │ {{:>{amt_len}}}{{}}'
-    for item, name, amt_s in zip(cart, names, amounts):
+    # Build each row's strings and track the column widths in one pass over
+    # the cart, rather than iterating it again per column.
+    rows = []
+    name_len = 0
+    amt_len = 0
+    for item in cart:
+        name = item.name or item.description or item.code or "Unknown Item"
+        amt_s = str(item.total_price)
         if item.quantity != 1:
             unit_s = f" ({item.quantity:,g} @ {item.unit_price})"
         else:
             unit_s = ""
-        print(line_fmt.format(name, amt_s, unit_s), file=stream)
+        name_len = max(name_len, len(name))
+        amt_len = max(amt_len, len(amt_s))
+        rows.append((name, amt_s, unit_s))
+    line_fmt = f'  {{:>{name_len}}} │ {{:>{amt_len}}}{{}}'
+    lines.extend(line_fmt.format(*row) for row in rows)
+    # One write per transaction instead of one per line keeps the stream
+    # lock and syscall count off the hot loop.
+    lines.append('')
+    stream.write('\n'.join(lines))
 
 def main(
         arglist: Optional[Sequence[str]]=None,
@@ -166,9 +200,14 @@ def main(
     cliutil.set_loglevel(logger, args.loglevel)
 
     config = configmod.load_config(args.config_file)
-    if args.config_section not in config:
-        config.add_section(args.config_section)
-    paypal = clientmod.PayPalAPIClient.from_config(config[args.config_section])
+    # Freeze the section into a plain dict so every read downstream is a
+    # bare dict lookup instead of SectionProxy's case-folding machinery —
+    # and so the parser load_config caches and shares is never mutated.
+    if args.config_section in config:
+        section = dict(config[args.config_section])
+    else:
+        section = {}
+    paypal = clientmod.PayPalAPIClient.from_config(section)
 
     if not args.paypal_ids:
         if args.start_date is None:
@@ -179,17 +218,32 @@ def main(
         ):
             summarize_transaction(txn, stdout)
     else:
+        if not getattr(yaml, '__with_libyaml__', False):
+            logger.debug(
+                "PyYAML was built without libyaml; YAML output will be slower",
+            )
         YAMLDumper.add_transaction_representer(args.transaction_fields)
-        for paypal_id in args.paypal_ids:
-            paypal_id = paypal_id.upper()
-            paypal_obj: paypal_types.APIResponse
-            if paypal_id.startswith('I-'):
-                paypal_obj = paypal.get_subscription(paypal_id, fields=args.subscription_fields)
-            else:
-                paypal_obj = paypal.get_transaction(
-                    paypal_id, args.end_date, args.start_date, args.transaction_fields,
-                )
-            yaml.dump([paypal_obj], stdout, Dumper=YAMLDumper)
+        # Bind the lookup methods once outside the loop; the per-ID work
+        # below then dispatches on a constant callable per branch.
+        get_subscription = paypal.get_subscription
+        get_transaction = paypal.get_transaction
+        def iter_objects() -> Iterator[paypal_types.APIResponse]:
+            for paypal_id in args.paypal_ids:
+                paypal_id = paypal_id.upper()
+                if paypal_id.startswith('I-'):
+                    yield get_subscription(paypal_id, fields=args.subscription_fields)
+                else:
+                    yield get_transaction(
+                        paypal_id, args.end_date, args.start_date, args.transaction_fields,
+                    )
+        # One dump_all call shares a single emitter across all documents,
+        # while the generator keeps memory bounded to one response at a time.
+        yaml.dump_all(
+            iter_objects(), stdout,
+            Dumper=YAMLDumper,
+            explicit_start=True,
+            default_flow_style=False,
+        )
     return 0
 
 entry_point = cliutil.make_entry_point(__name__, PROGNAME)
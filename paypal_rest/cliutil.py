@@ -21,12 +21,21 @@ import enum
 import logging
 import operator
 import os
-import pkg_resources
 import signal
 import sys
 import traceback
 import types
 
+# importlib.metadata answers version queries without pkg_resources' costly
+# scan of everything on sys.path, which every CLI invocation was paying.
+try:
+    from importlib.metadata import version as _distribution_version
+except ImportError:
+    # Python < 3.8
+    def _distribution_version(distribution_name: str) -> str:
+        import pkg_resources
+        return pkg_resources.require(distribution_name)[0].version  # type:ignore[no-any-return]
+
 from pathlib import Path
 
 import requests
@@ -43,7 +52,7 @@ from typing import (
     Union,
 )
 
-VERSION = pkg_resources.require(PKGNAME)[0].version
+VERSION = _distribution_version(PKGNAME)
 
 class ExceptHook:
     def __init__(self, logger: Optional[logging.Logger]=None) -> None:
@@ -15,23 +15,44 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import configparser
+import os
 
 from pathlib import Path
 from xdg import BaseDirectory  # type:ignore[import]
 
 from typing import (
+    Dict,
+    Tuple,
     Union,
 )
 
 CONFIG_PATH = Path('paypal_rest', 'config.ini')
 
+# Parsed configurations cached by path and stat signature, so repeat loads
+# in one process (tests, daemons) skip re-reading an unchanged file.
+_CACHE: Dict[Tuple[str, int, int], configparser.ConfigParser] = {}
+
 def load_config(path: Union[Path, str, None]=None) -> configparser.ConfigParser:
+    """Load user configuration from an INI file
+
+    ``path`` defaults to the user's XDG configuration path. Repeat calls
+    for a file that hasn't changed on disk return the same parser object.
+    """
     if path is None:
         path = BaseDirectory.load_first_config(str(CONFIG_PATH))
         if path is None:
             # This path doesn't exist, but we'll handle that case later.
             path = Path(BaseDirectory.xdg_config_home, CONFIG_PATH)
-    config = configparser.ConfigParser()
+    stat = os.stat(path)
+    cache_key = (os.fspath(path), stat.st_mtime_ns, stat.st_size)
+    try:
+        return _CACHE[cache_key]
+    except KeyError:
+        pass
+    # Client configuration values never use %-interpolation; skip the
+    # escape scanning it adds to every option read.
+    config = configparser.ConfigParser(interpolation=None)
     with open(path) as config_file:
         config.read_file(config_file)
+    _CACHE[cache_key] = config
     return config
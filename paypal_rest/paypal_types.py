@@ -15,6 +15,8 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import datetime
+import functools
+import sys
 
 from decimal import Decimal
 
@@ -25,21 +27,52 @@ from typing import (
     NamedTuple,
 )
 
-# Declare a type definition for the one function of iso8601 that we use.
-import iso8601  # type:ignore[import]
-parse_datetime: Callable[[str], datetime.datetime] = iso8601.parse_date
+def _parse_datetime(value: str) -> datetime.datetime:
+    """Parse an ISO 8601 datetime string from the API
+
+    PayPal always emits the fixed shape ``YYYY-MM-DDTHH:MM:SS±HH:MM``,
+    which strptime handles several times faster than iso8601's general
+    regex parser; anything else (including user-typed command line dates)
+    falls through to iso8601. Importing iso8601 here rather than at module
+    load keeps it off the import path of CLI runs that never need the
+    fallback.
+    """
+    try:
+        return datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z')
+    except ValueError:
+        import iso8601  # type:ignore[import]
+        return iso8601.parse_date(value)  # type:ignore[no-any-return]
+
+# Cache parses too: date strings repeat across paginated responses and
+# retried searches.
+parse_datetime: Callable[[str], datetime.datetime] = (
+    functools.lru_cache(maxsize=8192)(_parse_datetime)
+)
 
 APIResponse = Mapping[str, Any]
 
+@functools.lru_cache(maxsize=4096)
+def _cached_decimal(source: str) -> Decimal:
+    """Build a Decimal from an API number string, caching the result
+
+    Parsing a Decimal is surprisingly expensive, and listing responses
+    repeat the same handful of values (fees, zero amounts, unit prices)
+    over and over.
+    """
+    return Decimal(source)
+
 class Amount(NamedTuple):
     number: Decimal
     currency: str
 
     @classmethod
     def from_api(cls, source: APIResponse) -> 'Amount':
+        # Interning the currency code deduplicates the many copies a
+        # listing response carries and makes later comparisons pointer
+        # checks.
         return cls(
-            Decimal(source['value']),
-            source['currency_code'],
+            _cached_decimal(source['value']),
+            sys.intern(source['currency_code']),
         )
 
     def __str__(self) -> str:
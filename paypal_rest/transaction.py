@@ -15,6 +15,8 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import enum
+import functools
+import sys
 
 from . import errors
 
@@ -23,21 +25,52 @@ from decimal import Decimal
 from typing import (
     Any,
     Callable,
+    Dict,
     Iterable,
     Iterator,
+    List,
     NamedTuple,
     Optional,
+    Sequence,
+    Tuple,
     TypeVar,
     Union,
 )
 from .paypal_types import (
     Amount,
     APIResponse,
+    _cached_decimal,
     parse_datetime,
 )
 
 T = TypeVar('T')
 
+# Sentinel distinguishing "key absent" from a legitimate None value.
+_MISSING = object()
+
+# Key path shared by the cart methods' error re-walk.
+_CART_INFO_KEYS = ('cart_info',)
+
+@functools.lru_cache(maxsize=None)
+def _key_breadcrumb(keys: Tuple[str, ...]) -> str:
+    """Format a key path for a deep-miss KeyError message
+
+    There are only a handful of accessor key paths, so the formatted
+    breadcrumb is computed once per path rather than re-joined every time
+    a partially-loaded transaction misses.
+    """
+    return '→'.join(repr(key) for key in keys)
+
+def _intern_optional(value: Optional[str]) -> Optional[str]:
+    """Intern a string that may be None
+
+    Product codes, names, and descriptions repeat across the thousands of
+    cart items in a listing; interning makes the duplicates share storage
+    and turns their comparisons into pointer checks.
+    """
+    return None if value is None else sys.intern(value)
+
+
 class CartItem(NamedTuple):
     code: Optional[str]
     name: Optional[str]
@@ -48,16 +81,27 @@ class CartItem(NamedTuple):
 
     @classmethod
     def from_api(cls, source: APIResponse, default_name: Optional[str]=None) -> 'CartItem':
-        total_price = Amount.from_api(source['item_amount'])
-        quantity = Decimal(source.get('item_quantity', 1))
-        try:
-            unit_price = Amount.from_api(source['item_unit_price'])
-        except KeyError:
+        get = source.get
+        amount_from_api = Amount.from_api
+        total_price = amount_from_api(source['item_amount'])
+        raw_quantity = get('item_quantity')
+        if raw_quantity is None or raw_quantity == '1':
+            quantity: Union[int, Decimal] = 1
+        else:
+            quantity = _cached_decimal(raw_quantity)
+        unit_source = get('item_unit_price')
+        if unit_source is not None:
+            unit_price = amount_from_api(unit_source)
+        elif quantity == 1:
+            # Nearly every line item has quantity one, and then the unit
+            # price just is the total price: skip the Decimal division.
+            unit_price = total_price
+        else:
             unit_price = total_price._replace(number=total_price.number / quantity)
         return cls(
-            source.get('item_code'),
-            source.get('item_name', default_name),
-            source.get('item_description'),
+            _intern_optional(get('item_code')),
+            _intern_optional(get('item_name', default_name)),
+            _intern_optional(get('item_description')),
             quantity,
             unit_price,
             total_price,
@@ -78,6 +122,15 @@ class TransactionStatus(enum.Enum):
     REVERSED = V
 
 
+# PayPal only ever sends the single-letter status codes, so resolve them
+# through a plain dict instead of the Enum's member-map machinery.
+_STATUS_BY_CODE = {
+    member.name: member
+    for member in TransactionStatus
+    if len(member.name) == 1
+}
+_status_of: Callable[[str], TransactionStatus] = _STATUS_BY_CODE.__getitem__
+
 class Transaction(APIResponse):
     """PayPal Transaction wrapper
 
@@ -86,10 +139,13 @@ class Transaction(APIResponse):
     missing a method you need, you can also use standarding Mapping methods to
     access to raw response.
     """
-    __slots__ = ['_response']
+    __slots__ = ['_response', '_cache']
 
     def __init__(self, response: APIResponse) -> None:
         self._response = response
+        # Accessor results memoized by name; reporting loops read the same
+        # fields several times per transaction.
+        self._cache: Dict[str, Any] = {}
 
     def __getitem__(self, key: str) -> Any:
         return self._response[key]
@@ -100,7 +156,10 @@ class Transaction(APIResponse):
     def __len__(self) -> int:
         return len(self._response)
 
-    def _get_from_response(self, *keys: str) -> Any:
+    def _get_from_response(self, keys: Sequence[str]) -> Any:
+        # Takes the key path as one pre-built tuple rather than *args, so
+        # callers pass the same constant tuple they walked instead of
+        # packing a fresh one per call.
         retval = self._response
         for index, key in enumerate(keys):
             try:
@@ -111,7 +170,7 @@ class Transaction(APIResponse):
                 except KeyError:
                     txn_id = "Transaction"
                 if index:
-                    key_s = '→'.join(repr(key) for key in keys[:index + 1])
+                    key_s = _key_breadcrumb(tuple(keys[:index + 1]))
                     raise KeyError(f"{txn_id} {key_s}") from None
                 else:
                     raise errors.MissingFieldError(
@@ -138,8 +197,81 @@ class Transaction(APIResponse):
                 else:
                     return_doc = func.__name__
             doc = f"Return the transaction's {key_doc} as a ``{return_doc}``"
-        def response_wrapper(self: 'Transaction') -> T:
-            return func(self._get_from_response(*keys))
+        # Generate a wrapper specialized for this accessor's key depth. The
+        # hot path checks the per-instance memo, then indexes straight into
+        # the response dict; on a miss, _get_from_response re-walks the keys
+        # purely to raise the right error with a descriptive message.
+        if len(keys) == 1:
+            def response_wrapper(self: 'Transaction',
+                                 _name: str=name, _keys: Sequence[str]=keys,
+                                 _k0: str=keys[0], _func: Callable[[Any], T]=func) -> T:
+                cache = self._cache
+                try:
+                    return cache[_name]  # type:ignore[no-any-return]
+                except KeyError:
+                    pass
+                try:
+                    source = self._response[_k0]
+                except KeyError:
+                    source = self._get_from_response(_keys)
+                retval = cache[_name] = _func(source)
+                return retval
+        elif len(keys) == 2:
+            def response_wrapper(self: 'Transaction',  # type:ignore[misc]
+                                 _name: str=name, _keys: Sequence[str]=keys,
+                                 _k0: str=keys[0], _k1: str=keys[1],
+                                 _func: Callable[[Any], T]=func) -> T:
+                cache = self._cache
+                try:
+                    return cache[_name]  # type:ignore[no-any-return]
+                except KeyError:
+                    pass
+                # An unloaded info section is the one miss that actually
+                # happens in practice; check it with a sentinel get() so the
+                # common probe stays outside exception handling.
+                info = self._response.get(_k0, _MISSING)
+                if info is _MISSING:
+                    info = self._get_from_response(_keys[:1])
+                try:
+                    source = info[_k1]
+                except KeyError:
+                    source = self._get_from_response(_keys)
+                retval = cache[_name] = _func(source)
+                return retval
+        elif len(keys) == 3:
+            def response_wrapper(self: 'Transaction',  # type:ignore[misc]
+                                 _name: str=name, _keys: Sequence[str]=keys,
+                                 _k0: str=keys[0], _k1: str=keys[1], _k2: str=keys[2],
+                                 _func: Callable[[Any], T]=func) -> T:
+                cache = self._cache
+                try:
+                    return cache[_name]  # type:ignore[no-any-return]
+                except KeyError:
+                    pass
+                try:
+                    source = self._response[_k0][_k1][_k2]
+                except KeyError:
+                    source = self._get_from_response(_keys)
+                retval = cache[_name] = _func(source)
+                return retval
+        else:
+            def response_wrapper(self: 'Transaction',  # type:ignore[misc]
+                                 _name: str=name,
+                                 _keys: Sequence[str]=keys,
+                                 _func: Callable[[Any], T]=func) -> T:
+                cache = self._cache
+                try:
+                    return cache[_name]  # type:ignore[no-any-return]
+                except KeyError:
+                    pass
+                source: Any = self._response
+                try:
+                    for key in _keys:
+                        source = source[key]
+                except KeyError:
+                    source = self._get_from_response(_keys)
+                retval = cache[_name] = _func(source)
+                return retval
         response_wrapper.__name__ = name
         response_wrapper.__doc__ = doc
         return response_wrapper
@@ -187,7 +319,7 @@ class Transaction(APIResponse):
     )
     status = _wrap_response(
         'status',
-        TransactionStatus.__getitem__,
+        _status_of,
         'transaction_info',
         'transaction_status',
         return_doc=TransactionStatus.__name__,
@@ -207,18 +339,55 @@ class Transaction(APIResponse):
 
     def cart_items(self) -> Iterator[CartItem]:
         """Iterate a ``CartItem`` object for each item in the transaction's cart"""
-        cart_info = self._get_from_response('cart_info')
+        # Work on the raw response dict directly; __getitem__ dispatch costs
+        # on every transaction summarized.
+        response = self._response
+        try:
+            cart_info = response['cart_info']
+        except KeyError:
+            # Re-walk purely to raise MissingFieldError with the usual
+            # message.
+            cart_info = self._get_from_response(_CART_INFO_KEYS)
         try:
             item_seq = cart_info['item_details']
         except KeyError:
             pass
         else:
             try:
-                default_name = self['transaction_info']['transaction_subject']
+                default_name = response['transaction_info']['transaction_subject']
             except KeyError:
                 default_name = None
             for source in item_seq:
-                try:
+                # Screen incomplete items (refunds carry bare quantities)
+                # with a membership test; raising and catching KeyError per
+                # item costs an exception frame even when it doesn't fire.
+                if 'item_amount' in source:
                     yield CartItem.from_api(source, default_name)
-                except KeyError:
-                    pass
+
+    def cart_items_list(self) -> List[CartItem]:
+        """Return a list of a ``CartItem`` for each item in the transaction's cart
+
+        Like ``cart_items``, but materialized in one pass: callers that want
+        the whole cart anyway skip the generator's per-item frame resumption,
+        and items are screened with a membership test instead of catching
+        ``KeyError`` from each construction.
+        """
+        response = self._response
+        try:
+            cart_info = response['cart_info']
+        except KeyError:
+            cart_info = self._get_from_response(_CART_INFO_KEYS)
+        try:
+            item_seq = cart_info['item_details']
+        except KeyError:
+            return []
+        try:
+            default_name = response['transaction_info']['transaction_subject']
+        except KeyError:
+            default_name = None
+        from_api = CartItem.from_api
+        return [
+            from_api(source, default_name)
+            for source in item_seq
+            if 'item_amount' in source
+        ]
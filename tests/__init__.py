@@ -14,40 +14,57 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import functools
 import itertools
+import json
+import threading
 import typing
 import urllib.parse as urlparse
 
 import requests
 
-FLOAT_NUMBERS = [
+FLOAT_NUMBERS = (
     '1200.30',
     '255.75',
     '99.99',
     '5.00',
     '0.00',
-]
-FLOAT_NUMBERS.extend(f'-{s}' for s in FLOAT_NUMBERS[:-1])
+    '-1200.30',
+    '-255.75',
+    '-99.99',
+    '-5.00',
+)
 
-WHOLE_NUMBERS = [
+WHOLE_NUMBERS = (
     '1250',
     '255',
     '99',
     '5',
     '0',
-]
-WHOLE_NUMBERS.extend(f'-{s}' for s in WHOLE_NUMBERS[:-1])
+    '-1250',
+    '-255',
+    '-99',
+    '-5',
+)
+
+# Most assertions only read .params, so URLs are parsed lazily, and the
+# cache covers the few distinct URLs each test hits.
+_parse_url = functools.lru_cache(maxsize=None)(urlparse.urlparse)
 
 class ReceivedRequest(typing.NamedTuple):
     method: str
-    url: urlparse.ParseResult
+    url: str
     params: typing.Mapping[str, str]
 
+    @property
+    def url_parsed(self):
+        return _parse_url(self.url)
+
     @classmethod
     def from_args(cls, method, url, params):
         return cls(
             method,
-            urlparse.urlparse(url),
+            url,
             dict(params or ()),
         )
 
@@ -77,6 +94,10 @@ class MockResponse:
         body.update(kwargs)
         return cls(body, status_code)
 
+    @property
+    def content(self):
+        return json.dumps(self._body).encode('utf-8')
+
     def json(self):
         return self._body.copy()
 
@@ -93,6 +114,8 @@ class MockSession:
 
     def __init__(self, *responses, infinite=False):
         self._requests = []
+        # The client may request pages from multiple threads.
+        self._lock = threading.Lock()
         if infinite:
             self._responses = itertools.cycle(responses)
         else:
@@ -102,8 +125,9 @@ class MockSession:
             )
 
     def request(self, method, url, params=None):
-        self._requests.append(ReceivedRequest.from_args(method, url, params))
-        return next(self._responses)
+        with self._lock:
+            self._requests.append(ReceivedRequest.from_args(method, url, params))
+            return next(self._responses)
 
     def get(self, url, params=None):
         return self.request('GET', url, params)
@@ -0,0 +1,177 @@
+"""test_aclient.py - Unit tests for the asynchronous PayPal API client"""
+# Copyright © 2020  Brett Smith
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import datetime
+import time
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+
+from paypal_rest import client as client_mod
+from paypal_rest import aclient as aclient_mod
+
+START_DATE = datetime.datetime(2020, 10, 1, 12, tzinfo=datetime.timezone.utc)
+END_DATE = START_DATE.replace(day=25)
+
+class StubResponse:
+    """Async stand-in for an aiohttp response
+
+    Usable as the async context manager ``ClientSession.get``/``post``
+    return. ``delay`` makes ``json()`` yield to the event loop first, to
+    simulate a slow response completing after a later one.
+    """
+    def __init__(self, body, status=200, delay=0):
+        self._body = body
+        self.status = status
+        self._delay = delay
+
+    async def json(self):
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        return self._body
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(None, (), status=self.status)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+class StubSession:
+    """Async counterpart to ``tests.MockSession``
+
+    Records GET and token POST requests and answers them from queues. The
+    event loop serializes access, so no locking is needed.
+    """
+    def __init__(self, *responses, token_responses=()):
+        self._requests = []
+        self._posts = []
+        self._responses = iter(responses)
+        self._token_responses = iter(token_responses)
+
+    def get(self, url, params=None, headers=None):
+        self._requests.append((url, dict(params or {}), dict(headers or {})))
+        return next(self._responses)
+
+    def post(self, url, data=None, auth=None):
+        self._posts.append((url, dict(data or {})))
+        return next(self._token_responses)
+
+    async def close(self):
+        pass
+
+
+def token_cache_key(client_id, client_secret):
+    return (client_mod.PayPalSession.TOKEN_PATH, client_id, client_secret)
+
+def seed_token(client_id, client_secret, access_token='TESTTOKEN'):
+    with client_mod._TOKEN_CACHE_LOCK:
+        client_mod._TOKEN_CACHE[token_cache_key(client_id, client_secret)] = {
+            'access_token': access_token,
+            'expires_at': time.time() + 3600,
+        }
+
+@pytest.fixture
+def client_creds():
+    """Per-test credentials, scrubbed from the shared token cache afterward"""
+    creds = ('asyncid', 'asyncsecret')
+    yield creds
+    with client_mod._TOKEN_CACHE_LOCK:
+        client_mod._TOKEN_CACHE.pop(token_cache_key(*creds), None)
+
+async def stubbed_client(session, client_creds):
+    paypal = aclient_mod.AsyncPayPalAPIClient.from_client_secret(*client_creds)
+    await paypal._session.close()
+    paypal._session = session
+    return paypal
+
+def page_response(page, total_pages, txn_id, delay=0):
+    return StubResponse({
+        'page': page,
+        'total_pages': total_pages,
+        'transaction_details': [
+            {'transaction_info': {'transaction_id': txn_id}},
+        ],
+    }, delay=delay)
+
+def test_fetch_window_pagination(client_creds):
+    seed_token(*client_creds)
+    session = StubSession(
+        page_response(1, 3, 'PAGE1TXN'),
+        page_response(2, 3, 'PAGE2TXN'),
+        page_response(3, 3, 'PAGE3TXN'),
+    )
+    async def fetch():
+        paypal = await stubbed_client(session, client_creds)
+        async with paypal:
+            return await paypal._fetch_window({'fields': 'transaction_info'})
+    txns = asyncio.run(fetch())
+    assert [txn.transaction_id() for txn in txns] == [
+        'PAGE1TXN', 'PAGE2TXN', 'PAGE3TXN',
+    ]
+    assert session._requests[0][1].get('page') == '1'
+    assert {params.get('page') for _, params, _ in session._requests} == {
+        '1', '2', '3',
+    }
+
+def test_aiter_transactions_window_order(client_creds):
+    seed_token(*client_creds)
+    start_date = START_DATE
+    end_date = start_date + datetime.timedelta(days=45)
+    # The first window's response is delayed past the second's, so this
+    # checks transactions still come out in window order.
+    session = StubSession(
+        page_response(1, 1, 'WINDOW1TXN', delay=.01),
+        page_response(1, 1, 'WINDOW2TXN'),
+    )
+    async def collect():
+        paypal = await stubbed_client(session, client_creds)
+        async with paypal:
+            return [
+                txn.transaction_id()
+                async for txn in paypal.aiter_transactions(start_date, end_date)
+            ]
+    assert asyncio.run(collect()) == ['WINDOW1TXN', 'WINDOW2TXN']
+    assert len(session._requests) == 2
+    # Requests are issued in window order, so the yielded order above must
+    # match the order of the date windows requested.
+    window_starts = [params['start_date'] for _, params, _ in session._requests]
+    assert window_starts == sorted(window_starts)
+
+def test_get_json_401_retry(client_creds):
+    seed_token(*client_creds, access_token='STALETOKEN')
+    session = StubSession(
+        StubResponse({}, status=401),
+        StubResponse({'test': 'ok'}),
+        token_responses=[
+            StubResponse({'access_token': 'NEWTOKEN', 'expires_in': 3600}),
+        ],
+    )
+    async def fetch():
+        paypal = await stubbed_client(session, client_creds)
+        async with paypal:
+            return await paypal._get_json('/test', {})
+    assert asyncio.run(fetch()) == {'test': 'ok'}
+    assert len(session._posts) == 1
+    assert session._posts[0][0].endswith(client_mod.PayPalSession.TOKEN_PATH)
+    auth_headers = [headers['Authorization'] for _, _, headers in session._requests]
+    assert auth_headers == ['Bearer STALETOKEN', 'Bearer NEWTOKEN']
@@ -28,6 +28,8 @@ from paypal_rest import transaction as txn_mod
 START_DATE = datetime.datetime(2020, 10, 1, 12, tzinfo=datetime.timezone.utc)
 END_DATE = START_DATE.replace(day=25)
 
+_INFO_SUFFIX_RE = re.compile(r'_info$')
+
 def test_transaction_type():
     txn_id = 'TYPETEST123456789'
     session = MockSession(
@@ -49,8 +51,11 @@ def test_transaction_pagination(pages):
     paypal = client_mod.PayPalAPIClient(session)
     actual = list(paypal.iter_transactions(START_DATE, END_DATE))
     assert len(session._requests) == pages
-    for expect_page, request in enumerate(session._requests, 1):
-        assert request.params.get('page') == str(expect_page)
+    # Page 1 is always fetched first; later pages are prefetched
+    # concurrently, so they may arrive in any order.
+    assert session._requests[0].params.get('page') == '1'
+    expected_pages = {str(page) for page in range(1, pages + 1)}
+    assert {request.params.get('page') for request in session._requests} == expected_pages
 
 @pytest.mark.parametrize('index,key', enumerate(['start_date', 'end_date']))
 def test_transaction_date_formatting(index, key):
@@ -83,7 +88,7 @@ def test_transaction_fields_formatting(fields):
     _ = list(paypal.iter_transactions(START_DATE, END_DATE, fields_arg))
     assert session._requests
     assert fields == {
-        re.sub(r'_info$', '', name)
+        _INFO_SUFFIX_RE.sub('', name)
         for name in session._requests[0].params.get('fields', '').split(',')
     }
 
@@ -101,14 +106,18 @@ def test_iter_transactions_date_window(days_diff):
     assert req_count == ((days_diff // 30) + 1)
     start_str = start_date.isoformat(timespec='seconds')
     end_str = end_date.isoformat(timespec='seconds')
-    prev_end = start_str
-    for number, request in enumerate(session._requests, 1):
-        assert request.params['start_date'] == prev_end
-        if number == req_count:
-            assert request.params['end_date'] == end_str
-        else:
-            assert prev_end < request.params['end_date'] < end_str
-            prev_end = request.params['end_date']
+    # Date windows may be fetched concurrently, so sort them by start date
+    # before checking that they chain across the full range.
+    windows = sorted(
+        (request.params['start_date'], request.params['end_date'])
+        for request in session._requests
+    )
+    assert windows[0][0] == start_str
+    assert windows[-1][1] == end_str
+    for window_start, window_end in windows:
+        assert start_str <= window_start < window_end <= end_str
+    for (_, prev_end), (next_start, _) in zip(windows, windows[1:]):
+        assert prev_end == next_start
 
 @pytest.mark.parametrize('days_diff', [10, 45, 89])
 def test_get_transactions_date_window(days_diff):
@@ -134,6 +143,25 @@ def test_get_transactions_date_window(days_diff):
             assert prev_start > request.params['start_date'] > start_str
             prev_start = request.params['start_date']
 
+def test_subscription_cache():
+    body = {'id': 'I-CACHETEST12345', 'status': 'ACTIVE'}
+    session = MockSession(MockResponse(body), MockResponse(body))
+    paypal = client_mod.PayPalAPIClient(session, subscription_cache={})
+    first = paypal.get_subscription('I-CACHETEST12345')
+    assert paypal.get_subscription('I-CACHETEST12345') == first
+    assert len(session._requests) == 1
+    paypal.invalidate_subscription('I-CACHETEST12345')
+    assert paypal.get_subscription('I-CACHETEST12345') == first
+    assert len(session._requests) == 2
+
+def test_subscription_not_cached_by_default():
+    body = {'id': 'I-CACHETEST12345', 'status': 'ACTIVE'}
+    session = MockSession(MockResponse(body), MockResponse(body))
+    paypal = client_mod.PayPalAPIClient(session)
+    paypal.get_subscription('I-CACHETEST12345')
+    paypal.get_subscription('I-CACHETEST12345')
+    assert len(session._requests) == 2
+
 @pytest.mark.parametrize('name', [
     'BAD_REQUEST',
     'UNAUTHORIZED',
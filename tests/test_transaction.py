@@ -168,6 +168,16 @@ def test_cart_quantity_only():
     txn = txn_mod.Transaction({'cart_info': source})
     assert not any(txn.cart_items())
 
+def test_cart_items_list():
+    source = cart_info(
+        {'number': '5.99'},
+        {'name': 'Test', 'number': '7.99', 'quantity': 2},
+    )
+    # A priceless item, as in refunds, should be screened out.
+    source['item_details'].append({'item_quantity': '1.000'})
+    txn = txn_mod.Transaction({'cart_info': source})
+    assert txn.cart_items_list() == list(txn.cart_items())
+
 @pytest.mark.parametrize('number', FLOAT_NUMBERS)
 def test_fee_amount_float(number):
     source = transaction_info(fee_number=number, fee_currency='USD')
@@ -220,6 +230,7 @@ def test_updated_date():
 @pytest.mark.parametrize('method_name', [
     'amount',
     'cart_items',
+    'cart_items_list',
     'fee_amount',
     'payer_email',
     'payer_fullname',